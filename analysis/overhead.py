@@ -15,27 +15,74 @@
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
-import numpy as np
 import pandas as pd
-import json
 import networkx as nx
+import os
+import pathlib
 import sys
-from itertools import chain
-from utils import select_measurement
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from utils import select_measurement, load_json
+
+SUMMARY_KEYS = ["topo", "scenario", "spec", "spec_kind", "spec_iter"]
+SUMMARY_PERCENTILES = [10, 25, 50, 75, 90]
+
+Result = namedtuple(
+    "Result", ["kind", "steps", "cost", "mem", "mem_sitn", "mem_baseline"]
+)
+
+
+def parse_result(r):
+    inf = float("inf")
+    if not isinstance(r, dict):
+        return Result(r, inf, inf, inf, inf, inf)
+    kind, r = next(iter(r.items()))
+    if kind != "Success":
+        return Result(kind, int(r["steps"]), int(r["cost"]), inf, inf, inf)
+    return Result(
+        kind,
+        int(r["steps"]),
+        int(r["cost"]),
+        int(r["max_routes"]),
+        int(r["routes_before"] + r["routes_after"]),
+        int(r["max_routes_baseline"]),
+    )
 
 
 def build_graph(data):
     old = data["data"]["fw_state_before"]["state"]
     new = data["data"]["fw_state_after"]["state"]
     p = next(iter(next(iter(old.values())).keys()))
-    old = {int(k): v[p][0] for k, v in old.items()}
-    new = {int(k): v[p][0] for k, v in new.items()}
-    edges = {(a, b) for a, b in chain(old.items(), new.items())}
+    edges = {(int(k), v[p][0]) for state in (old, new) for k, v in state.items()}
     g = nx.DiGraph()
     g.add_edges_from(edges)
     return (g, 4294967295)
 
 
+def count_cycles(g, c):
+    # no simple cycle can leave its strongly connected component, so only
+    # enumerate cycles within the non-trivial components (or self-loops).
+    return sum(
+        1
+        for scc in c.nodes.values()
+        if len(scc["members"]) > 1 or g.has_edge(*scc["members"], *scc["members"])
+        for _ in nx.simple_cycles(g.subgraph(scc["members"]))
+    )
+
+
+def count_potential_deps(c, nodes):
+    # propagate the reachable nodes bottom-up on the condensation, such that
+    # every node of the graph is traversed only once.
+    reach = {}
+    for scc in reversed(list(nx.topological_sort(c))):
+        reach[scc] = c.nodes[scc]["members"] & nodes
+        for succ in c.successors(scc):
+            reach[scc] |= reach[succ]
+    # `nx.descendants` does not include the source itself.
+    return sum(len(reach[c.graph["mapping"][s]]) - 1 for s in nodes)
+
+
 def running_time(data):
     try:
         schedule = next(iter(data["decomp"]["schedule"].values()))
@@ -47,92 +94,47 @@ def running_time(data):
 
 
 def summarize_statistics(stats):
-    data = {}
-    # summarize them
-    for stat in stats:
-        key = (
-            stat["topo"],
-            stat["scenario"],
-            stat["spec"],
-            stat["spec_kind"],
-            stat["spec_iter"],
-        )
-        if key in data:
-            data[key].append(stat)
-        else:
-            data[key] = [stat]
-
-    processed = []
-    for stats in data.values():
-        times = np.array([s["time"] for s in stats])
-        x = stats[0]
-        [t10, t25, t50, t75, t90] = np.percentile(
-            times, [10, 25, 50, 75, 90], interpolation="nearest"
-        )
-        x["time"] = times.mean()
-        x["time_p10"] = t10
-        x["time_p25"] = t25
-        x["time_p50"] = t50
-        x["time_p75"] = t75
-        x["time_p90"] = t90
-
-        processed.append(x)
-
-    return processed
-
-
-def get_stats(file):
-    print(f"working on {file.name}")
+    df = pd.DataFrame(stats)
+    times = df.groupby(SUMMARY_KEYS, sort=False)["time"]
+    summary = times.quantile(
+        [p / 100 for p in SUMMARY_PERCENTILES], interpolation="nearest"
+    ).unstack()
+    summary.columns = [f"time_p{p}" for p in SUMMARY_PERCENTILES]
+    summary["time"] = times.mean()
+
+    # keep the first measurement of each group for all other columns
+    first = df.drop_duplicates(SUMMARY_KEYS).drop(columns=summary.columns)
+    return first.merge(summary.reset_index(), on=SUMMARY_KEYS)[df.columns]
 
-    with open(file, "r") as fp:
-        data = json.load(fp)
 
-    steps = float("inf")
-    mem_baseline = float("inf")
-    mem_sitn = float("inf")
-    mem = float("inf")
-    cost = float("inf")
+def get_stats(file, timeout=None):
+    print(f"working on {file.name}")
+
+    data = load_json(file)
 
-    if len(sys.argv) > 1:
-        timeout = float(sys.argv[1])
+    if timeout is not None:
         time = min(timeout, data["data"]["time"])
     else:
         time = data["data"]["time"]
 
-    (g, d) = build_graph(data)
-    updated_nodes = {n for n in g if g.degree(n) > 1}
-
-    if type(data["data"]["result"]) is dict:
-        result = next(iter(data["data"]["result"].keys()))
-        r = data["data"]["result"][result]
-        steps = int(r["steps"])
-        cost = int(r["cost"])
-        if result == "Success":
-            mem_baseline = int(r["max_routes_baseline"])
-            mem_sitn = int(r["routes_before"] + r["routes_after"])
-            mem = int(r["max_routes"])
-    else:
-        result = data["data"]["result"]
+    result = parse_result(data["data"]["result"])
 
     nodes = len(data["net"]["net"]["routers"])
-    spec = next(iter(data["spec"].values()))
-    try:
-        spec_name = f"Scalable-{data['spec_builder']['Scalable']:>03}"
-        spec_kind = f"Scalable"
-        spec_iter = data["spec_builder"]["Scalable"]
-    except:
-        try:
-            spec_name = (
-                f"ScalableNonTemporal-{data['spec_builder']['ScalableNonTemporal']:>03}"
-            )
-            spec_kind = f"ScalableNonTemporal"
-            spec_iter = data["spec_builder"]["ScalableNonTemporal"]
-        except:
-            spec_name = data["spec_builder"]
-            spec_kind = spec_name
-            spec_iter = 0
+    spec_builder = data["spec_builder"]
+    if isinstance(spec_builder, dict) and "Scalable" in spec_builder:
+        spec_iter = spec_builder["Scalable"]
+        spec_name = f"Scalable-{spec_iter:>03}"
+        spec_kind = "Scalable"
+    elif isinstance(spec_builder, dict) and "ScalableNonTemporal" in spec_builder:
+        spec_iter = spec_builder["ScalableNonTemporal"]
+        spec_name = f"ScalableNonTemporal-{spec_iter:>03}"
+        spec_kind = "ScalableNonTemporal"
+    else:
+        spec_name = spec_builder
+        spec_kind = spec_name
+        spec_iter = 0
 
-    return {
+    stats = {
         "topo": data["topo"],
         "scenario": data["scenario"],
         "spec": spec_name,
@@ -145,38 +147,56 @@ def get_stats(file):
         "time_p50": time,
         "time_p75": time,
         "time_p90": time,
-        "cost": cost,
-        "result": result,
+        "cost": result.cost,
+        "result": result.kind,
         "model_steps": data["data"]["model_steps"],
-        "steps": steps,
+        "steps": result.steps,
         "est_time": running_time(data),
-        "mem": mem,
-        "mem_sitn": mem_sitn,
-        "mem_baseline": mem_baseline,
+        "mem": result.mem,
+        "mem_sitn": result.mem_sitn,
+        "mem_baseline": result.mem_baseline,
         "num_variables": data["data"]["num_variables"],
         "num_equations": data["data"]["num_equations"],
         "avg_path_length": data["data"]["avg_path_length"],
+    }
+
+    # Only the forwarding graph is needed from here on. Release the parsed
+    # file (including the network and the schedule) before the graph analysis.
+    (g, _) = build_graph(data)
+    del data
+    updated_nodes = {n for n, deg in g.degree if deg > 1}
+    # both the cycle count and the dependencies work on the same condensation
+    c = nx.condensation(g)
+
+    return {
+        **stats,
         "num_fw_updates": len(updated_nodes),
-        "num_cycles": sum(1 for _ in nx.cycles.simple_cycles(g)),
-        "potential_deps": sum(
-            sum(1 for x in nx.descendants(g, s) if x in updated_nodes)
-            for s in updated_nodes
-        ),
+        "num_cycles": count_cycles(g, c),
+        "potential_deps": count_potential_deps(c, updated_nodes),
     }
 
 
 if __name__ == "__main__":
     experiment = select_measurement(prefix="overhead_")
-    stats = summarize_statistics(
-        [
-            get_stats(file)
-            for file in experiment.iterdir()
-            if not file.name.endswith(".csv")
+    timeout = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    with os.scandir(experiment) as it:
+        files = [
+            pathlib.Path(e.path)
+            for e in it
+            if not e.name.endswith((".csv", ".parquet"))
         ]
-    )
-    stats = pd.DataFrame(stats).sort_values(["nodes", "topo", "spec"])
+    with ProcessPoolExecutor() as ex:
+        stats = list(ex.map(partial(get_stats, timeout=timeout), files, chunksize=4))
+    stats = summarize_statistics(stats).sort_values(["nodes", "topo", "spec"])
     stats.to_csv(experiment / "parsed.csv", index=False)
     print(f"Written {experiment / 'parsed.csv'}")
+    try:
+        stats.to_parquet(experiment / "parsed.parquet", index=False)
+        print(f"Written {experiment / 'parsed.parquet'}")
+    except ImportError:
+        # pyarrow is not installed. Remove an outdated parquet file, such that
+        # the plot scripts fall back to the CSV file.
+        (experiment / "parsed.parquet").unlink(missing_ok=True)
     with pd.option_context(
         "display.max_rows", None, "display.max_columns", None, "display.width", 200
     ):  # more options can be specified also
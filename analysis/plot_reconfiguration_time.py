@@ -16,17 +16,15 @@
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
 import os
-import pandas as pd
 import plotly.express as px
 
-from utils import select_measurement
+from utils import select_measurement, read_parsed
 
 if __name__ == "__main__":
     path = select_measurement(contains="parsed.csv")
-    file = os.path.join(path, "parsed.csv")
     plot_file = os.path.join(path, "plot_reconfiguration_time.html")
 
-    df = pd.read_csv(file, sep=",")
+    df = read_parsed(path)
 
     fig = px.histogram(
         df, x="est_time", cumulative=True, nbins=1000, histnorm="percent"
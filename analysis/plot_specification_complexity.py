@@ -16,20 +16,18 @@
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
 import os
-import pandas as pd
 import plotly.graph_objects as go
 from plotly.colors import hex_to_rgb
 
-from utils import select_measurement
+from utils import select_measurement, read_parsed
 
 COLORS = ["#636EFA", "#FFA15A"]
 
 if __name__ == "__main__":
     path = select_measurement(contains="parsed.csv")
-    file = os.path.join(path, "parsed.csv")
     plot_file = os.path.join(path, "plot_specification_complexity.html")
 
-    df = pd.read_csv(file, sep=",")
+    df = read_parsed(path)
     fig = go.Figure()
 
     specs = sorted(list(set(df["spec_kind"])))
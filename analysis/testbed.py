@@ -26,23 +26,25 @@ FREQ_BASELINE = (50, 500)
 FREQ_CHAMELEON = (10, 500)
 
 
-def get_component(path, i):
-    return {m.group(i) for m in (REX.match(x) for x in os.listdir(path)) if m}
+def get_components(path):
+    with os.scandir(path) as it:
+        matches = [m for m in (REX.match(e.name) for e in it) if m]
+    return tuple({m.group(i) for m in matches} for i in (1, 2, 3))
 
 
 def get_raw_samples(path, src, pfx, dst):
-    with open(f"{path}/{src}-{pfx}-{dst}.csv", "r") as fp:
-        return [
-            float(l.split(",")[0])
-            for l in fp.readlines()
-            if not (l.startswith("time") or l.startswith("send_time"))
-        ]
+    # round_trip parses the timestamps exactly like `float()` would
+    return pd.read_csv(
+        f"{path}/{src}-{pfx}-{dst}.csv",
+        header=0,
+        usecols=[0],
+        dtype=np.float64,
+        float_precision="round_trip",
+    ).values.ravel()
 
 
 def read_data(path):
-    internals = get_component(path, 1)
-    externals = get_component(path, 3)
-    prefixes = get_component(path, 2)
+    internals, prefixes, externals = get_components(path)
 
     return (
         internals,
@@ -58,14 +60,22 @@ def read_data(path):
 
 
 def process_data(internals, prefixes, externals, raw, freq):
-    t_min = min(min(x) for x in raw.values() if x)
-    t_max = max(max(x) for x in raw.values() if x)
+    t_min = min(x.min() for x in raw.values() if len(x))
+    t_max = max(x.max() for x in raw.values() if len(x))
     bins = int((t_max - t_min) * freq[0])
-    samples = {
-        (src, pfx, dst): np.histogram(x, bins=bins, range=(t_min, t_max))[0]
-        for (src, pfx, dst), x in raw.items()
-    }
-    t = np.histogram([], bins=bins, range=(t_min, t_max))[1][:-1]
+    edges = np.histogram_bin_edges([], bins=bins, range=(t_min, t_max))
+
+    # bin all samples at once, tagging each sample with the index of its key.
+    keys = list(raw.keys())
+    x = np.concatenate([raw[k] for k in keys])
+    key_idx = np.repeat(np.arange(len(keys)), [len(raw[k]) for k in keys])
+    # same bins as `np.histogram`, where the last bin is closed on the right.
+    bin_idx = np.minimum(np.searchsorted(edges, x, side="right") - 1, bins - 1)
+    counts = np.bincount(key_idx * bins + bin_idx, minlength=len(keys) * bins)
+    counts = counts.reshape(len(keys), bins)
+    samples = dict(zip(keys, counts))
+
+    t = edges[:-1]
     if len(t) > 0:
         t_min = min(t)
         t = t - t_min
@@ -75,23 +85,18 @@ def process_data(internals, prefixes, externals, raw, freq):
 
 def data_per_egress(internals, prefixes, externals, samples, t, freq):
     norm = freq[0] / (freq[1] * len(internals) * len(prefixes))
-    data = {
-        dst.split("_")[0]: norm * sum(x for (_, _, d), x in samples.items() if d == dst)
-        for dst in externals
-    }
-    data["Sum"] = norm * sum(x for x in samples.values())
+    x = np.array(list(samples.values()))
+    dsts = np.array([d for (_, _, d) in samples.keys()])
+    data = {dst.split("_")[0]: norm * x[dsts == dst].sum(axis=0) for dst in externals}
+    data["Sum"] = norm * x.sum(axis=0)
     data["t"] = t
 
     # compute the violations
     tail = int(freq[0])
-    violations = sum(
-        norm * x
-        for dst in externals
-        for (_, _, d), x in samples.items()
-        if d == dst
-        if max(max(x[:tail]), max(x[len(x) - tail :])) == 0
-    )
-    data["violations"] = violations
+    head = x[:, :tail].max(axis=1)
+    trail = x[:, x.shape[1] - tail :].max(axis=1)
+    violated = (head == 0) & (trail == 0)
+    data["violations"] = (norm * x[violated]).sum(axis=0)
 
     data = pd.DataFrame(data)
     return data
@@ -15,9 +15,10 @@
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
-import json
 from pprint import pprint
 import pathlib
+from collections import defaultdict
+from utils import load_json
 
 
 def cmd(event):
@@ -48,8 +49,7 @@ measurement = "lab_atomic_2023-01-22_09-54-24"
 file = "event.json"
 
 event_file = f"{root}/{results}/{measurement}/{file}"
-with open(event_file, "r") as fp:
-    event_list = json.load(fp)
+event_list = load_json(event_file)
 
 events = {}
 
@@ -58,7 +58,12 @@ for event in event_list:
     kind = event["event"]
     elapsed = event["elapsed"][0] + event["elapsed"][1] / 1_000_000_000
     if id not in events:
-        events[id] = {"command": event["command"]}
+        events[id] = {
+            "command": event["command"],
+            "cmd": cmd(event),
+            "precond": precond(event),
+            "postcond": postcond(event),
+        }
 
     if kind in events[id]:
         raise ValueError(f"Received twice the event kind {kind} for event {id}")
@@ -69,17 +74,24 @@ for event in events.values():
     event["timePre"] = event["PreconditionSatisfied"] - event["Scheduled"]
     event["timePost"] = event["PostConditionSatisfied"] - event["PreconditionSatisfied"]
 
+# group the times of all events by their command and condition
+pre_groups = defaultdict(list)
+post_groups = defaultdict(list)
+for event in events.values():
+    pre_groups[(event["cmd"], event["precond"])].append(
+        int(round(event["timePre"] * 10)) / 10
+    )
+    post_groups[(event["cmd"], event["postcond"])].append(
+        int(round(event["timePost"] * 10)) / 10
+    )
+
 for event in events.values():
     if event["timePre"] < 5:
         continue
 
-    event_cmd = cmd(event)
-    event_cond = precond(event)
-    others = [
-        int(round(e["timePre"] * 10)) / 10
-        for e in events.values()
-        if cmd(e) == event_cmd and precond(event) == event_cond
-    ]
+    event_cmd = event["cmd"]
+    event_cond = event["precond"]
+    others = pre_groups[(event_cmd, event_cond)]
     print(f"\nSatisfying precondition took {event['timePre']} time:")
     print(f"  command:  {event_cmd}")
     print(f"  precond:  {event_cond}")
@@ -91,13 +103,9 @@ for event in events.values():
     if event["timePost"] < 5:
         continue
 
-    event_cmd = cmd(event)
-    event_cond = postcond(event)
-    others = [
-        int(round(e["timePost"] * 10)) / 10
-        for e in events.values()
-        if cmd(e) == event_cmd and postcond(event) == event_cond
-    ]
+    event_cmd = event["cmd"]
+    event_cond = event["postcond"]
+    others = post_groups[(event_cmd, event_cond)]
 
     print(f"\nSatisfying postcondition took {event['timePost']} time:")
     print(f"  command:  {event_cmd}")
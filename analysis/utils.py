@@ -18,6 +18,17 @@
 import pathlib
 import sys
 import os
+import pandas as pd
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+
+def load_json(file):
+    with open(file, "rb") as fp:
+        return _json.loads(fp.read())
 
 
 def select_measurement(prefix=None, suffix=None, contains=None):
@@ -39,3 +50,14 @@ def select_measurement(prefix=None, suffix=None, contains=None):
         print(f"{i: >3}: {child.name}")
     idx = int(input("choose an index: "))
     return children[idx]
+
+
+def read_parsed(path):
+    # prefer the typed parquet file if it was written, and pyarrow is available
+    file = os.path.join(path, "parsed.parquet")
+    if os.path.exists(file):
+        try:
+            return pd.read_parquet(file)
+        except ImportError:
+            pass
+    return pd.read_csv(os.path.join(path, "parsed.csv"), sep=",")